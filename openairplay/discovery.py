@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import sys
+import threading
 try:
     import zeroconf
 except ImportError:
@@ -8,7 +9,7 @@ except ImportError:
     print("Please ensure you have it installed.")
     sys.exit("Could not find zeroconf.")
 
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 
 import log
 import utils
@@ -26,47 +27,161 @@ from receiver_device import AirplayReceiver, AirplayFeatures
 
 # browser = None
 
+class _ScanListener(object):
+    """Receives the callbacks of one ServiceBrowser scan.
+
+    Callbacks from a browser that has since been replaced are dropped, so
+    a cancelled browser still draining its queue can't touch the next scan.
+    """
+    def __init__(self, owner):
+        self.owner = owner
+        self.seen = set() # names reported during this scan
+
+    @property
+    def current(self):
+        return self.owner._scan is self
+
+    def add_service(self, zeroconf, type, name):
+        if self.current:
+            self.seen.add(name)
+            self.owner.add_service(zeroconf, type, name)
+
+    def update_service(self, zeroconf, type, name):
+        if self.current:
+            self.seen.add(name)
+            self.owner.update_service(zeroconf, type, name)
+
+    def remove_service(self, zeroconf, type, name):
+        if self.current:
+            self.seen.discard(name)
+            self.owner.remove_service(zeroconf, type, name)
+
+
 class AirplayServiceListener(QObject):
-    receiver_added = pyqtSignal([AirplayReceiver])
-    receiver_removed = pyqtSignal([AirplayReceiver])
+    receiver_added = pyqtSignal(AirplayReceiver)
+    receiver_removed = pyqtSignal(AirplayReceiver)
+
+    def __init__(self, scan_interval: float = 5.0, pause_interval: float = 10.0):
+        super().__init__()
 
-    def __init__(self):
         self.ZC = zeroconf.Zeroconf()
-        self.browser = zeroconf.ServiceBrowser(self.ZC, "_airplay._tcp.local.", self)
+        self.browser = None
         self.devices = {}
+        # Guards self.devices, which browser threads may touch concurrently.
+        self._devices_lock = threading.Lock()
+        self.scan_interval = scan_interval
+        self.pause_interval = pause_interval
+        self._scan = None
+        self._paused = True # started by resume() once signals are connected
 
-        super().__init__()
+        # Browse in bursts of scan_interval seconds separated by
+        # pause_interval seconds, instead of keeping the browser live.
+        self._cycle_timer = QTimer(self)
+        self._cycle_timer.setSingleShot(True)
+        self._cycle_timer.timeout.connect(self._cycle)
+
+    def _start_scan(self):
+        self._scan = _ScanListener(self)
+        self.browser = zeroconf.ServiceBrowser(self.ZC, "_airplay._tcp.local.", self._scan)
+        self._cycle_timer.start(int(self.scan_interval * 1000))
+        log.debug("Started airplay receiver scan")
+
+    def _stop_scan(self):
+        # cancel() joins the browser thread, which may still be blocked in
+        # get_service_info(), so don't wait for it on the GUI thread.
+        canceller = threading.Thread(target=self.browser.cancel, daemon=True)
+        canceller.start()
+        self.browser = None
+        self._scan = None
+        log.debug("Stopped airplay receiver scan")
+        return canceller
+
+    def _cycle(self):
+        if self.browser is None:
+            self._start_scan()
+            return
+        seen = self._scan.seen
+        self._stop_scan()
+        # A new browser reports everything still in the zeroconf cache, so
+        # anything not seen during a full scan has gone away while we paused.
+        for name, device in list(self.devices.items()):
+            if device is not None and name not in seen:
+                self.remove_service(self.ZC, None, name)
+        self._cycle_timer.start(int(self.pause_interval * 1000))
+
+    def pause(self):
+        if self._paused:
+            return
+        self._paused = True
+        self._cycle_timer.stop()
+        if self.browser is not None:
+            self._stop_scan()
+        log.debug("Discovery paused")
+
+    def resume(self):
+        if not self._paused:
+            return
+        self._paused = False
+        self._start_scan()
+        log.debug("Discovery resumed")
 
     def remove_service(self, zeroconf, type, name):
         # airplayReceivers.remove(name)
-        if name not in self.devices:
-            log.warn(f"Device '{name}' not known, cannot remove service.")
+        with self._devices_lock:
+            device = self.devices.get(name)
+            if device is not None:
+                self.devices[name] = None # permit other references to persist
+        if device is None:
+            log.warn("Device '%s' not known, cannot remove service.", name)
             return
-        log.debug(f"Airplay receiver '{name}' removed")
-        self.receiver_removed.emit(self.devices[name])
-        self.devices[name] = None # permit other references to persist
+        log.debug("Airplay receiver '%s' removed", name)
+        self.receiver_removed.emit(device)
 
     def add_service(self, zeroconf, type, name):
-        log.debug(f"Adding device '{name}' ...")
+        # Known devices are replayed from the zeroconf cache on every scan,
+        # so this is answered from the cache rather than the network.
         info = zeroconf.get_service_info(type, name)
-        # airplayReceivers.append(name)
-        self.devices[name] = AirplayReceiver(
-            name, info,
-            # **{k.decode(): v.decode() for k, v in info.properties.items()}
-        )
-        log.debug(f"Airplay receiver '{name}' added, constructed: {self.devices[name]}")
-        self.receiver_added.emit(self.devices[name])
+        if info is None:
+            log.warn("No service info for device '%s', cannot add service.", name)
+            return
+        with self._devices_lock:
+            device = self.devices.get(name)
+            if device is not None:
+                # Already known from an earlier scan cycle, but it may have
+                # changed while no browser was running.
+                device.update_service_info(info)
+                return
+            log.debug("Adding device '%s' ...", name)
+            # airplayReceivers.append(name)
+            device = self.devices[name] = AirplayReceiver(
+                name, info,
+                # **{k.decode(): v.decode() for k, v in info.properties.items()}
+            )
+        log.debug("Airplay receiver '%s' added, constructed: %s", name, device)
+        self.receiver_added.emit(device)
 
-        log.debug(f"Receiver addresses: {self.devices[name]._get_ip_addresses()}")
+        if log.isEnabledFor(log.DEBUG):
+            log.debug("Receiver addresses: %s", device._get_ip_addresses())
 
     def update_service(self, zeroconf, type, name):
+        if self.devices.get(name) is None:
+            log.warn("Device '%s' not known, cannot update service.", name)
+            return
         info = zeroconf.get_service_info(type, name)
-        if name not in self.devices:
-            log.warn(f"Device '{name}' not known, cannot update service.")
+        if info is None:
+            log.warn("No service info for device '%s', cannot update service.", name)
             return
-        self.devices[name].update_service_info(info)
-        log.debug(f"Airplay receiver '{name}' service updated: {self.devices[name]}")
+        with self._devices_lock:
+            device = self.devices.get(name)
+            if device is None:
+                return
+            device.update_service_info(info)
+        log.debug("Airplay receiver '%s' service updated: %s", name, device)
 
     def quit(self):
+        self._cycle_timer.stop()
+        if self.browser is not None:
+            # Give the browser thread a moment, but don't hang on exit.
+            self._stop_scan().join(timeout=1.0)
         self.ZC.close()
         log.debug("Closed ZC browser")
@@ -1,15 +1,21 @@
 #!/usr/bin/env python3
 #  Copyright (C) 2015-2016 Ben Klein.
 
+from __future__ import annotations
+
+import os
 import sys
+from typing import TYPE_CHECKING
 
 import log
-from receiver_device import AirplayReceiver
+
+if TYPE_CHECKING:
+    from receiver_device import AirplayReceiver
 
 log.setLevel(log.DEBUG)
 log.debug("Debugging enabled.")
-log.debug("Called with system args: " + str(sys.argv))
-log.debug("Python version: " + sys.version)
+log.debug("Called with system args: %s", sys.argv)
+log.debug("Python version: %s", sys.version)
 
 # Qt GUI stuff
 try:
@@ -24,6 +30,25 @@ except ImportError:
 # Airplay Things:
 import discovery
 
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'images')
+
+# (combo box label, image file) for each selectable tray icon.
+TRAY_ICONS = (
+    ("Black Icon", 'Airplay-Light.xpm'),
+    ("White Icon", 'Airplay-Dark.xpm'),
+)
+
+_icon_cache = {}
+
+def load_icon(filename):
+    # Load each icon from disk once and share it between the combo box,
+    # tray and window. Needs a QApplication, so can't run at import time.
+    if filename not in _icon_cache:
+        icon = QtGui.QIcon(os.path.join(IMAGES_DIR, filename))
+        icon.pixmap(QtCore.QSize(32, 32)) # warm Qt's pixmap cache
+        _icon_cache[filename] = icon
+    return _icon_cache[filename]
+
 
 class Window(QtWidgets.QWidget):
     def __init__(self):
@@ -33,6 +58,20 @@ class Window(QtWidgets.QWidget):
         # Establishes a hook on our system settings.
         # http://pyqt.sourceforge.net/Docs/PyQt4/pyqt_qsettings.html
 
+        # Read the settings needed to build the window once, up front.
+        # Writes still go through self.settings.
+        self._cached_settings = {
+            'systrayicon': self.settings.value('systrayicon', type=bool),
+            'promptOnClose_systray': self.settings.value('promptOnClose_systray', type=bool),
+        }
+
+        # Index of list entries by receiver, so removal needn't scan the list.
+        self._receiver_items = {}
+
+        # Created once the window has painted, see paintEvent.
+        self.service_listener = None
+        self._discovery_scheduled = False
+
         # Place items in our window.
         self.createIconGroupBox() # Tray Icon Settings
         self.createMessageGroupBox() # Test notification group
@@ -70,8 +109,7 @@ class Window(QtWidgets.QWidget):
         self.resize(400, 300)
 
         # If the user chose not to show the system tray icon:
-        if self.settings.value('systrayicon', type=bool) is False:
-            print("The user chose not to show the system tray icon.")
+        if not self._cached_settings['systrayicon']:
             self.trayIconVisible(False)
 
         # # Setup stuff to poll available receivers every 3 seconds.
@@ -80,19 +118,42 @@ class Window(QtWidgets.QWidget):
         # self.timer.start(3000)
         # self.timer.timeout.connect(self.updateReceivers)
 
+    def paintEvent(self, event):
+        super(Window, self).paintEvent(event)
+        # Start discovery (zeroconf sockets, browser threads) only after
+        # the window has actually been painted once.
+        if not self._discovery_scheduled:
+            self._discovery_scheduled = True
+            QtCore.QTimer.singleShot(0, self.startDiscovery)
+
+    def startDiscovery(self):
         # Start discovery of airplay receivers:
         log.debug("Starting discovery service...")
-        self.service_listener = discovery.AirplayServiceListener()
+        self.service_listener = discovery.AirplayServiceListener(
+            scan_interval=5.0, pause_interval=10.0)
 
         self.service_listener.receiver_added.connect(self.add_receiver)
         self.service_listener.receiver_removed.connect(self.remove_receiver)
 
+        # The listener starts paused; begin scanning if the window is shown.
+        self.updateDiscoveryState()
+
     def setVisible(self, visible):
         # When we want to 'disappear' into the system tray.
         self.minimizeAction.setEnabled(visible)
         #self.maximizeAction.setEnabled(not self.isMaximized())
         self.restoreAction.setEnabled(self.isMaximized() or not visible)
         super(Window, self).setVisible(visible)
+        self.updateDiscoveryState()
+
+    def updateDiscoveryState(self):
+        # Only scan for receivers while the device list can be seen.
+        if self.service_listener is None:
+            return
+        if self.isVisible():
+            self.service_listener.resume()
+        else:
+            self.service_listener.pause()
 
     def closeEvent(self, event):
         # When someone clicks to close the window, not the tray icon.
@@ -114,7 +175,7 @@ class Window(QtWidgets.QWidget):
 
     def setIcon(self, index):
         # Sets the selected icon in the tray and taskbar.
-        icon = self.iconComboBox.itemIcon(index)
+        icon = load_icon(TRAY_ICONS[index][1])
         self.trayIcon.setIcon(icon)
         self.setWindowIcon(icon)
 
@@ -148,17 +209,19 @@ class Window(QtWidgets.QWidget):
         "see the Github page to file bug reports or see further documentation and help.")
 
     def add_receiver(self, receiver: AirplayReceiver):
-        log.debug(f"Adding receiver to UI: {receiver.list_entry_name}")
+        log.debug("Adding receiver to UI: %s", receiver.list_entry_name)
         item = QtWidgets.QListWidgetItem(receiver.list_entry_name)
         self.deviceSelectList.addItem(item)
-        log.debug(f"Added receiver to deviceSelectList: '{receiver.name}'")
+        self._receiver_items[receiver] = item
+        log.debug("Added receiver to deviceSelectList: '%s'", receiver.name)
 
     def remove_receiver(self, receiver: AirplayReceiver):
-        item_name = receiver.list_entry_name
-        items = self.deviceSelectList.findItems(item_name, QtCore.Qt.MatchExactly)
-        for x in items:
-            self.deviceSelectList.takeItem(self.deviceSelectList.row(x))
-            log.debug(f"Removed receiver from deviceSelectList: '{receiver.name}'")
+        item = self._receiver_items.pop(receiver, None)
+        if item is None:
+            log.warn("Receiver '%s' not in deviceSelectList, cannot remove.", receiver.name)
+            return
+        self.deviceSelectList.takeItem(self.deviceSelectList.row(item))
+        log.debug("Removed receiver from deviceSelectList: '%s'", receiver.name)
 
     def createIconGroupBox(self): # Add the SysTray preferences window grouping
         self.iconGroupBox = QtWidgets.QGroupBox("Tray Icon")
@@ -166,16 +229,14 @@ class Window(QtWidgets.QWidget):
         self.iconLabel = QtWidgets.QLabel("Icon:")
 
         self.iconComboBox = QtWidgets.QComboBox()
-        self.iconComboBox.addItem(QtGui.QIcon('../images/Airplay-Light'), "Black Icon")
-        self.iconComboBox.addItem(QtGui.QIcon('../images/Airplay-Dark'), "White Icon")
+        for label, filename in TRAY_ICONS:
+            self.iconComboBox.addItem(load_icon(filename), label)
 
         self.showIconCheckBox = QtWidgets.QCheckBox("Show tray icon")
-        self.showIconCheckBox.setChecked(self.settings.value('systrayicon', type=bool))
-        print("Got systrayicon from settings:" + str(self.settings.value('systrayicon', type=bool)))
+        self.showIconCheckBox.setChecked(self._cached_settings['systrayicon'])
 
         self.systrayClosePromptCheckBox = QtWidgets.QCheckBox("Systray Close warning")
-        self.systrayClosePromptCheckBox.setChecked(self.settings.value('promptOnClose_systray', type=bool))
-        print("Got promptOnClose_systray from settings:" + str(self.settings.value('promptOnClose_systray', type=bool)))
+        self.systrayClosePromptCheckBox.setChecked(self._cached_settings['promptOnClose_systray'])
 
         iconLayout = QtWidgets.QHBoxLayout()
         iconLayout.addWidget(self.iconLabel)
@@ -276,7 +337,8 @@ class Window(QtWidgets.QWidget):
 
     def quit(self, reason):
         del self.settings
-        self.service_listener.quit()
+        if self.service_listener is not None:
+            self.service_listener.quit()
         sys.exit(reason)
 
 if __name__ == '__main__':
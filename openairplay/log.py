@@ -169,6 +169,7 @@ dbg = debug = logger.debug
 crit = critical = logger.critical
 warn = warning = logger.warning
 setLevel = logger.setLevel
+isEnabledFor = logger.isEnabledFor
 DEBUG = logging.DEBUG
 INFO = logging.INFO
 WARN = logging.WARNING